@@ -11,8 +11,30 @@ Features:
 """
 
 import os # operating system
+import sys
 import random
 import json
+import difflib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from operator import attrgetter
+from contextlib import contextmanager
+try:
+    import orjson  # C-level JSON encoder/decoder, much faster on big nested trees
+except ImportError:  # non-CPython platforms fall back to the stdlib json module
+    orjson = None
+try:
+    import ujson  # faster drop-in for json.load when orjson is missing
+except ImportError:
+    ujson = None
+try:
+    import msgspec  # binary MessagePack on disk: no number/text conversion, smaller files
+except ImportError:
+    msgspec = None
+try:
+    import readline  # TAB completion for the manual navigation prompts
+except ImportError:  # not available on Windows
+    readline = None
 from spotipy import Spotify
 from spotipy.oauth2 import SpotifyClientCredentials
 from dotenv import load_dotenv
@@ -23,23 +45,151 @@ sp = Spotify(auth_manager=SpotifyClientCredentials(
     client_id=os.getenv("SPOTIFY_CLIENT_ID"),
     client_secret=os.getenv("SPOTIFY_CLIENT_SECRET")
 ))
+SPOTIFY_MARKET = os.getenv("SPOTIFY_MARKET", "US")  # searching in one market makes Spotify leave out the long available_markets lists
+MENU = "\n".join([
+    "\nWelcome to Yggdrasil — The Tree of Music",
+    "Options:",
+    "1. Manual navigation",
+    "2. Random song",
+    "3. Search Spotify for a song",
+]) + "\n"  # built once and written in one go each time the menu is shown
+_background = ThreadPoolExecutor(max_workers=1)  # runs Spotify lookups while the user is busy reading a prompt
+if readline is not None:
+    if "libedit" in (readline.__doc__ or ""): #macOS ships libedit, which binds keys differently
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+
+JSON_FILE = "yggdrasil.json"
+MSGPACK_FILE = "yggdrasil.ygg.mpk"
+GENRE_CACHE_FILE = ".genre_cache.json"  # artist_id -> genre map kept between runs
 
 Yggdrasil = {}  #global music tree, initialized as empty dict
+_GENRE_CACHE = {}  # artist_id -> genre, so each artist only costs one Spotify lookup
+_keys_cache = {}  # path tuple like (genre, artist) -> tuple of the keys at that level
+_lookup = {}  # path tuple -> {lowercased key: real key} for forgiving manual navigation
+_display_cache = {}  # path tuple -> "a, b, c" string shown in the manual navigation prompts
+_flat_index = None  # flat list of (genre, artist, album, song) paths, None until (re)built
+_dirty = False  # True once Yggdrasil has changes that are not yet saved to disk
+_migrated_json = False  # True while Yggdrasil came from yggdrasil.json but still has to be saved as .mpk
+_loaded_stamp = None  # (filename, mtime, size) of the file Yggdrasil was last loaded from or saved to
 
 
 # =======================================s==
 # DATA STRUCTURE FUNCTIONS
 # =========================================
 
+@dataclass
+class SongMeta:
+    """Spotify metadata stored for every song leaf in Yggdrasil."""
+    # Declared by hand (not dataclass(slots=True), which needs Python 3.10+): keeps each stored song much smaller than a dict
+    __slots__ = ("song_name", "artist", "album", "artist_id", "spotify_url", "duration_ms", "track_number")
+    song_name: str
+    artist: str
+    album: str
+    artist_id: str
+    spotify_url: str
+    duration_ms: int
+    track_number: int
+
+    def to_dict(self):
+        """Plain dict version, used when saving with the stdlib json module."""
+        return {
+            "song_name": self.song_name,
+            "artist": self.artist,
+            "album": self.album,
+            "artist_id": self.artist_id,
+            "spotify_url": self.spotify_url,
+            "duration_ms": self.duration_ms,
+            "track_number": self.track_number,
+        }
+
+    @classmethod
+    def _fast_from_dict(cls, d):
+        """Rebuild a SongMeta from a saved dict, skipping __init__ for bulk loading."""
+        obj = object.__new__(cls)
+        for name in cls.__slots__:
+            object.__setattr__(obj, name, d[name])
+        return obj
+
+
 def add_song(genre, artist, album, song_name, metadata=None): #checks each layer of Yggdrasil to see if the request exist in the physical world tree or not
     """Safely add a song to the nested Yggdrasil dictionary."""
-    if genre not in Yggdrasil:
-        Yggdrasil[genre] = {}
-    if artist not in Yggdrasil[genre]:
-        Yggdrasil[genre][artist] = {}
-    if album not in Yggdrasil[genre][artist]:
-        Yggdrasil[genre][artist][album] = {}
-    Yggdrasil[genre][artist][album][song_name] = metadata or {}
+    global _dirty, _flat_index
+    Yggdrasil.setdefault(genre, {}).setdefault(artist, {}).setdefault(album, {})[song_name] = metadata or {} #one lookup per layer, creating it if missing
+    _dirty = True
+    _flat_index = None #rebuilt on the next random pick
+    for path in ((), (genre,), (genre, artist), (genre, artist, album)): #levels whose keys may have changed
+        _keys_cache.pop(path, None)
+        _lookup.pop(path, None)
+        _display_cache.pop(path, None)
+
+
+def cached_keys(path, node):
+    """Return the keys of one Yggdrasil level as a tuple, rebuilt only after that level changes."""
+    keys = _keys_cache.get(path)
+    if keys is None:
+        keys = _keys_cache[path] = tuple(node)
+    return keys
+
+
+def match_key(path, node, user_input):
+    """Match user input to a key of one Yggdrasil level, ignoring case and allowing partial or misspelled names."""
+    if user_input in node:
+        return user_input
+    lookup = _lookup.get(path)
+    if lookup is None:
+        lookup = _lookup[path] = {key.lower(): key for key in node}
+    wanted = user_input.strip().lower()
+    if not wanted: #an empty answer would be a "partial match" of every key
+        return None
+    if wanted in lookup: #exact match, just in a different case
+        return lookup[wanted]
+    partial = [key for lowered, key in lookup.items() if wanted in lowered]
+    if len(partial) == 1: #only accept a partial name if it points to one key
+        return partial[0]
+    close = difflib.get_close_matches(wanted, lookup, n=1)
+    return lookup[close[0]] if close else None
+
+
+def set_completions(options):
+    """Let TAB complete the given names at the next prompt. Returns what restore_completions needs to undo it."""
+    if readline is None:
+        return None
+    saved = (readline.get_completer(), readline.get_completer_delims())
+    matches = []
+    def completer(text, state):
+        if state == 0: #readline asks for state 0, 1, 2... until it gets None
+            matches[:] = [option for option in options if option.startswith(text)]
+        return matches[state] if state < len(matches) else None
+    readline.set_completer(completer)
+    readline.set_completer_delims("") #complete whole names, even ones with spaces
+    return saved
+
+
+def restore_completions(saved):
+    """Put back the completer and delimiters that were active before set_completions."""
+    if saved is None:
+        return
+    completer, delims = saved
+    readline.set_completer(completer)
+    readline.set_completer_delims(delims)
+
+
+def choose_key(path, node, prompt):
+    """Ask the user to pick one key of a Yggdrasil level. Returns None if nothing matches."""
+    display = _display_cache.get(path)
+    if display is None: #only join the names again after this level changes
+        display = _display_cache[path] = ", ".join(node.keys())
+    saved = set_completions(cached_keys(path, node))
+    try:
+        user_input = input(f"{prompt} ({display}): ")
+    finally: #leave readline as we found it, e.g. for a REPL that imported this module
+        restore_completions(saved)
+    key = match_key(path, node, user_input)
+    if key is None:
+        print(f"Nothing in Yggdrasil matches '{user_input}'.")
+    return key
 
 
 # =========================================
@@ -48,7 +198,7 @@ def add_song(genre, artist, album, song_name, metadata=None): #checks each layer
 
 def search_song_on_spotify(song_name, limit=7): #Limit to number of songs returned is defaulted to 7
     """Search Spotify for a song and return the top results."""
-    results = sp.search(q=f"track:{song_name}", type="track", limit=limit)
+    results = sp.search(q=f"track:{song_name}", type="track", limit=limit, market=SPOTIFY_MARKET)
     tracks = results.get("tracks", {}).get("items", [])
     if not tracks:
         print(f"No results found for '{song_name}'")
@@ -56,37 +206,59 @@ def search_song_on_spotify(song_name, limit=7): #Limit to number of songs return
 
     metadata_list = []
     for track in tracks:
-        metadata_list.append({
-            "song_name": track["name"],
-            "artist": track["artists"][0]["name"],
-            "album": track["album"]["name"],
-            "artist_id": track["artists"][0]["id"],
-            "spotify_url": track["external_urls"]["spotify"],
-            "duration_ms": track["duration_ms"],
-            "track_number": track["track_number"],
-        }) #compiles each specific layer of metadata in a list and maps them
+        metadata_list.append(SongMeta(
+            song_name=track["name"],
+            artist=track["artists"][0]["name"],
+            album=track["album"]["name"],
+            artist_id=track["artists"][0]["id"],
+            spotify_url=track["external_urls"]["spotify"],
+            duration_ms=track["duration_ms"],
+            track_number=track["track_number"],
+        )) #compiles each specific layer of metadata in a list and maps them
     return metadata_list
 
 
+def prefetch_genres(artist_ids):
+    """Fetch genres for many artists at once using Spotify's batch artists endpoint."""
+    missing = list({artist_id for artist_id in artist_ids if artist_id not in _GENRE_CACHE})
+    for start in range(0, len(missing), 50): #Spotify accepts up to 50 IDs per request
+        data = sp.artists(missing[start:start + 50])
+        for artist in data.get("artists", []):
+            if artist: #unknown IDs come back as null
+                genres = artist.get("genres", [])
+                _GENRE_CACHE[artist["id"]] = genres[0] if genres else "Unknown"
+
+
 def get_artist_genre(artist_id):
     """Fetch genres for a given artist ID."""
+    if artist_id in _GENRE_CACHE: #each lookup is a Spotify API round-trip, so only ask once per artist
+        return _GENRE_CACHE[artist_id]
     artist = sp.artist(artist_id)
     genres = artist.get("genres", []) #default return value
-    return genres[0] if genres else "Unknown"
+    _GENRE_CACHE[artist_id] = genres[0] if genres else "Unknown"
+    return _GENRE_CACHE[artist_id]
 
 
 def add_song_dynamic(song_name):
-    """Search for a song, fetch metadata, and add it to Yggdrasil."""
+    """Search for a song, fetch metadata, and add it to Yggdrasil. Returns (metadata, genre) or None."""
     results = search_song_on_spotify(song_name)
     if not results:
         return None
 
     # If multiple results, let the user choose
     if len(results) > 1:
-        print(f"\nFound multiple results for '{song_name}':")
-        for i, track in enumerate(results, start=1): #enumerate adds a counter to the i variable which is then passed into the f string in line 88
-            print(f"{i}. {track['song_name']} by {track['artist']} (Album: {track['album']})")
-        choice = input("Select a number (or 0 to cancel): ")
+        # Look up every result's genre in the background while the user is choosing
+        prefetch = _background.submit(prefetch_genres, [track.artist_id for track in results])
+        get = attrgetter("song_name", "artist", "album")
+        lines = [f"{i}. {name} by {artist} (Album: {album})" for i, (name, artist, album) in enumerate(map(get, results), start=1)] #enumerate adds the 1, 2, 3... counter
+        print(f"\nFound multiple results for '{song_name}':\n" + "\n".join(lines)) #one write for the whole list
+        try:
+            choice = input("Select a number (or 0 to cancel): ")
+        finally: #also on Ctrl+C, so the worker is done with _GENRE_CACHE before it gets saved
+            try:
+                prefetch.result() #usually done long before the user has typed a number
+            except Exception: #get_artist_genre below falls back to a single lookup
+                pass
         try:
             choice = int(choice)
             if choice == 0:
@@ -98,51 +270,199 @@ def add_song_dynamic(song_name):
     else:
         metadata = results[0]
 
-    genre = get_artist_genre(metadata["artist_id"])
-    add_song(genre, metadata["artist"], metadata["album"], metadata["song_name"], metadata)
-    save_yggdrasil()
-    print(f"\nAdded '{metadata['song_name']}' under genre '{genre}' to Yggdrasil.")
-    return metadata
+    genre = get_artist_genre(metadata.artist_id)
+    add_song(genre, metadata.artist, metadata.album, metadata.song_name, metadata) #saved once on exit, not after every add
+    print(f"\nAdded '{metadata.song_name}' under genre '{genre}' to Yggdrasil.")
+    return metadata, genre
 
 
 # =========================================
 # RANDOM SELECTION FUNCTIONS
 # =========================================
 
-def random_genre():
-    return random.choice(list(Yggdrasil.keys()))
-
-def random_artist(genre):
-    return random.choice(list(Yggdrasil[genre].keys()))
-
-def random_album(genre, artist):
-    return random.choice(list(Yggdrasil[genre][artist].keys()))
-
-def random_song(genre, artist, album):
-    return random.choice(list(Yggdrasil[genre][artist][album].keys()))
+def random_song_path():
+    """Pick a (genre, artist, album, song) uniformly over every song in Yggdrasil."""
+    global _flat_index
+    if _flat_index is None:
+        _flat_index = [
+            (genre, artist, album, song)
+            for genre, artists in Yggdrasil.items()
+            for artist, albums in artists.items()
+            for album, songs in albums.items()
+            for song in songs
+        ]
+    return _flat_index[random.randrange(len(_flat_index))]
 
 
 # =========================================
 # SAVE / LOAD FUNCTIONS
 # =========================================
 
-def save_yggdrasil(filename="yggdrasil.json"):
-    """Save the full Yggdrasil dictionary to a JSON file."""
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(Yggdrasil, f, indent=4)
+def _song_to_dict(obj):
+    """json.dump hook: turn SongMeta leaves into plain dicts."""
+    if isinstance(obj, SongMeta):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _songs_from_dicts(tree):
+    """Turn the plain dict leaves of a freshly loaded tree back into SongMeta objects."""
+    from_dict = SongMeta._fast_from_dict #bound once, called for every song
+    return {
+        genre: {
+            artist: {
+                album: {song: from_dict(meta) if meta else {} for song, meta in songs.items()}
+                for album, songs in albums.items()
+            }
+            for artist, albums in artists.items()
+        }
+        for genre, artists in tree.items()
+    }
+
+
+def _file_stamp(filename):
+    """Return (filename, mtime, size) for a file, or None if it doesn't exist."""
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return None
+    return filename, stat.st_mtime_ns, stat.st_size
+
+
+@contextmanager
+def atomic_write(filename, mode, **kwargs):
+    """Write to a temp file next to filename and only swap it in once writing fully succeeded,
+    so a crash mid-save never leaves a half-written file behind."""
+    tmp = filename + ".tmp"
+    try:
+        with open(tmp, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno()) #make sure the bytes are on disk before the rename
+        os.replace(tmp, filename) #atomic: readers see either the old file or the new one
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def store_file():
+    """Pick the file Yggdrasil lives in. An existing .mpk always wins, so an old JSON copy is never used by mistake."""
+    if os.path.exists(MSGPACK_FILE) or msgspec is not None:
+        return MSGPACK_FILE
+    return JSON_FILE
+
+
+def _require_msgspec(filename):
+    """Fail clearly when a MessagePack file is needed but msgspec isn't installed."""
+    if filename.endswith(".mpk") and msgspec is None:
+        raise ImportError(f"{filename} is stored as MessagePack — install msgspec (pip install msgspec) to use it.")
+
+
+def save_yggdrasil(filename=None):
+    """Save the full Yggdrasil dictionary to a MessagePack (.mpk) or JSON file."""
+    global _dirty, _loaded_stamp, _migrated_json
+    if filename is None:
+        filename = store_file()
+    _require_msgspec(filename)
+    if filename.endswith(".mpk"): #msgspec and orjson encode SongMeta dataclasses natively
+        with atomic_write(filename, "wb") as f:
+            f.write(msgspec.msgpack.encode(Yggdrasil))
+    elif orjson is not None:
+        with atomic_write(filename, "wb") as f: #write one genre at a time so only one genre's bytes are in memory at once
+            f.write(b"{")
+            for i, (genre, artists) in enumerate(Yggdrasil.items()):
+                f.write(b",\n" if i else b"\n")
+                f.write(orjson.dumps(genre) + b": ")
+                f.write(orjson.dumps(artists, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            f.write(b"\n}" if Yggdrasil else b"}")
+    else:
+        with atomic_write(filename, "w", encoding="utf-8") as f:
+            json.dump(Yggdrasil, f, indent=4, default=_song_to_dict) #json.dump already writes chunk by chunk via iterencode
+    _dirty = False
+    _loaded_stamp = _file_stamp(filename) #what's on disk now matches Yggdrasil
     print(f"Yggdrasil saved to {filename}.")
-
-
-def load_yggdrasil(filename="yggdrasil.json"):
-    """Load Yggdrasil data from a JSON file if it exists."""
-    global Yggdrasil
-    if os.path.exists(filename):
-        with open(filename, "r", encoding="utf-8") as f:
-            Yggdrasil = json.load(f)
+    if _migrated_json and filename.endswith(".mpk"): #move the imported JSON aside so it can't be mistaken for the real store
+        if os.path.exists(JSON_FILE):
+            os.replace(JSON_FILE, JSON_FILE + ".bak")
+            print(f"Moved the old {JSON_FILE} to {JSON_FILE}.bak.")
+        _migrated_json = False
+
+
+def load_yggdrasil(filename=None):
+    """Load Yggdrasil data from a MessagePack (.mpk) or JSON file if it exists."""
+    global Yggdrasil, _dirty, _flat_index, _loaded_stamp, _migrated_json
+    if filename is None:
+        filename = store_file()
+    _require_msgspec(filename)
+    migrating = False
+    if filename.endswith(".mpk") and not os.path.exists(filename) and os.path.exists(JSON_FILE): #older saves were always JSON
+        print(f"No {filename} found — importing {JSON_FILE} instead.")
+        filename = JSON_FILE
+        migrating = True
+    stamp = _file_stamp(filename)
+    if stamp is not None and stamp == _loaded_stamp and not _dirty and not migrating:
+        return #the file hasn't changed since we last loaded or saved it, so Yggdrasil already matches it
+    if stamp is not None: #decode into a local first, so a bad file leaves the current tree and caches untouched
+        if filename.endswith(".mpk"):
+            with open(filename, "rb") as f:
+                tree = msgspec.msgpack.decode(f.read())
+        elif orjson is not None:
+            with open(filename, "rb") as f:
+                tree = orjson.loads(f.read())
+        else:
+            with open(filename, "r", encoding="utf-8") as f:
+                tree = (ujson or json).load(f)
+        tree = _songs_from_dicts(tree)
+    else:
+        tree = {}
+    Yggdrasil = tree
+    _dirty = migrating #so an imported JSON file gets written back in the new format on exit
+    _migrated_json = migrating
+    _flat_index = None
+    _keys_cache.clear()
+    _lookup.clear()
+    _display_cache.clear()
+    _loaded_stamp = stamp #only now, so a file that failed to decode is read again next time
+    if stamp is not None:
+        # Every saved song already tells us its artist's genre, so no need to ask Spotify again
+        _GENRE_CACHE.update(
+            (meta.artist_id, genre)
+            for genre, artists in Yggdrasil.items()
+            for albums in artists.values()
+            for songs in albums.values()
+            for meta in songs.values()
+            if meta
+        )
         print(f"Loaded Yggdrasil from {filename}.")
     else:
         print("No saved Yggdrasil found — starting fresh.")
-        Yggdrasil = {}
+
+
+def save_genre_cache(filename=GENRE_CACHE_FILE):
+    """Save the artist -> genre cache, including artists that were looked up but never added."""
+    if orjson is not None:
+        with atomic_write(filename, "wb") as f:
+            f.write(orjson.dumps(_GENRE_CACHE))
+    else:
+        with atomic_write(filename, "w", encoding="utf-8") as f:
+            json.dump(_GENRE_CACHE, f)
+
+
+def load_genre_cache(filename=GENRE_CACHE_FILE):
+    """Load the artist -> genre cache saved by a previous run, if there is one."""
+    try:
+        if orjson is not None:
+            with open(filename, "rb") as f:
+                _GENRE_CACHE.update(orjson.loads(f.read()))
+        else:
+            with open(filename, "r", encoding="utf-8") as f:
+                _GENRE_CACHE.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    except ValueError: #truncated or hand-edited file; the cache can always be rebuilt
+        print(f"Could not read {filename} — starting with an empty genre cache.")
+        _GENRE_CACHE.clear()
 
 
 # =========================================
@@ -151,53 +471,61 @@ def load_yggdrasil(filename="yggdrasil.json"):
 
 def enter_bragi():
     """Allow the user to manually explore, get a random song, or search dynamically. Named after the Norse god of Music and Poetry: Bragi"""
-    print("\nWelcome to Yggdrasil — The Tree of Music")
-    print("Options:\n1. Manual navigation\n2. Random song\n3. Search Spotify for a song")
+    sys.stdout.write(MENU)
+    sys.stdout.flush()
     choice = input("Select an option (1/2/3): ")
 
     if choice == "1":
         if not Yggdrasil:
             print("Yggdrasil is empty. Try option 3 to add songs.")
             return
-        genre = input(f"\nEnter a genre ({', '.join(Yggdrasil.keys())}): ")
-        artist = input(f"Enter an artist ({', '.join(Yggdrasil[genre].keys())}): ")
-        album = input(f"Enter an album ({', '.join(Yggdrasil[genre][artist].keys())}): ")
-        song = input(f"Enter a song ({', '.join(Yggdrasil[genre][artist][album].keys())}): ")
+        genre = choose_key((), Yggdrasil, "\nEnter a genre")
+        if genre is None:
+            return
+        artist = choose_key((genre,), Yggdrasil[genre], "Enter an artist")
+        if artist is None:
+            return
+        album = choose_key((genre, artist), Yggdrasil[genre][artist], "Enter an album")
+        if album is None:
+            return
+        song = choose_key((genre, artist, album), Yggdrasil[genre][artist][album], "Enter a song")
+        if song is None:
+            return
         metadata = Yggdrasil[genre][artist][album][song]
 
     elif choice == "2":
         if not Yggdrasil:
             print("Yggdrasil is empty. Try option 3 to add songs.")
             return
-        genre = random_genre()
-        artist = random_artist(genre)
-        album = random_album(genre, artist)
-        song = random_song(genre, artist, album)
+        genre, artist, album, song = random_song_path() #every song is equally likely, whatever its genre
         metadata = Yggdrasil[genre][artist][album][song]
 
     elif choice == "3":
         song_name = input("Enter the name of the song you want: ")
-        metadata = add_song_dynamic(song_name)
-        if not metadata:
+        result = add_song_dynamic(song_name)
+        if not result:
             return
-        genre = get_artist_genre(metadata["artist_id"])
-        artist = metadata["artist"]
-        album = metadata["album"]
-        song = metadata["song_name"]
+        metadata, genre = result #genre was already looked up while adding the song
+        artist = metadata.artist
+        album = metadata.album
+        song = metadata.song_name
 
     else:
         print("Invalid input. Try again.")
         return
 
-    # Display sorted metadata
-    print("\n--- Song Info ---")
-    print(f"Song: {song}")
-    print(f"Artist: {artist}")
-    print(f"Album: {album}")
-    print(f"Genre: {genre}")
-    print(f"Spotify URL: {metadata.get('spotify_url')}")
-    print(f"Duration (ms): {metadata.get('duration_ms')}")
-    print(f"Track number: {metadata.get('track_number')}")
+    # Display sorted metadata in a single write
+    sys.stdout.write("\n".join([
+        "\n--- Song Info ---",
+        f"Song: {song}",
+        f"Artist: {artist}",
+        f"Album: {album}",
+        f"Genre: {genre}",
+        f"Spotify URL: {getattr(metadata, 'spotify_url', None)}", #getattr also covers songs added without metadata ({})
+        f"Duration (ms): {getattr(metadata, 'duration_ms', None)}",
+        f"Track number: {getattr(metadata, 'track_number', None)}",
+    ]) + "\n")
+    sys.stdout.flush()
 
 
 # =========================================
@@ -205,13 +533,22 @@ def enter_bragi():
 # =========================================
 
 if __name__ == "__main__":
-    load_yggdrasil()
-    while True:
-        enter_bragi()
-        cont = input("\nDo you want to continue? (y/n): ").lower()
-        if cont != "y":
-            break
-    save_yggdrasil()
+    if "--export-json" in sys.argv[1:]: #write a human-readable copy of the tree and quit
+        load_yggdrasil()
+        save_yggdrasil(JSON_FILE)
+        sys.exit()
+    load_genre_cache()
+    load_yggdrasil() #loaded second so genres from the tree itself win
+    try:
+        while True:
+            enter_bragi()
+            cont = input("\nDo you want to continue? (y/n): ").lower()
+            if cont != "y":
+                break
+    finally: #still save new songs if the session is interrupted (e.g. Ctrl+C)
+        if _dirty:
+            save_yggdrasil()
+        save_genre_cache()
     print("Thank you for visiting The World Tree of Music!", end="")
     print("\n")
     print("This has been Yggdrasil.")